@@ -2,14 +2,67 @@ from typing import Dict, List, Any
 import json
 from datamodel import Listing, Observation, Order, OrderDepth, ProsperityEncoder, Symbol, Trade, TradingState
 import math
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
 
 class Logger:
-    def __init__(self) -> None:
-        self.logs = ""
+    def __init__(self, level: int = INFO, ring_size: int = 16) -> None:
+        if ring_size < 1:
+            raise ValueError("ring_size must be at least 1")
+        self.logs: list[str] = []
+        self.length = 0
         self.max_log_length = 3750
+        self.level = level
+        self.modules: dict[str, int] = {} # per module level, overrides self.level
+        self.budget = self.max_log_length // 3 # room for logs in the next flush, refined after every flush
+        self.ring: deque[str] = deque(maxlen=ring_size) # most recent high priority messages, always flushed first
+        self.ring_length = 0
+        self.ring_level = WARNING
+
+    def enable(self, module: str, level: int = DEBUG) -> None:
+        self.modules[module] = level
+
+    def disable(self, module: str) -> None:
+        self.modules[module] = ERROR + 1
 
-    def print(self, *objects: Any, sep: str = " ", end: str = "\n") -> None:
-        self.logs += sep.join(map(str, objects)) + end
+    def enabled(self, level: int, module: str = None) -> bool:
+        return level >= self.modules.get(module, self.level)
+
+    def print(self, *objects: Any, sep: str = " ", end: str = "\n", level: int = INFO, module: str = None) -> None:
+        # objects are only formatted once we know the message is enabled and will not be truncated away
+        if level < self.modules.get(module, self.level):
+            return
+        if level >= self.ring_level:
+            message = sep.join(map(str, objects)) + end
+            if len(self.ring) == self.ring.maxlen:
+                self.ring_length -= len(self.ring[0])
+            self.ring.append(message)
+            self.ring_length += len(message)
+            # drop the oldest entries first so the newest ones fit the budget
+            while len(self.ring) > 1 and self.ring_length > self.budget:
+                self.ring_length -= len(self.ring.popleft())
+            return
+        if self.length + self.ring_length >= self.budget:
+            return
+        message = sep.join(map(str, objects)) + end
+        self.logs.append(message)
+        self.length += len(message)
+
+    def debug(self, *objects: Any, module: str = None) -> None:
+        self.print(*objects, level=DEBUG, module=module)
+
+    def info(self, *objects: Any, module: str = None) -> None:
+        self.print(*objects, level=INFO, module=module)
+
+    def warning(self, *objects: Any, module: str = None) -> None:
+        self.print(*objects, level=WARNING, module=module)
+
+    def error(self, *objects: Any, module: str = None) -> None:
+        self.print(*objects, level=ERROR, module=module)
 
     def flush(self, state: TradingState, orders: dict[Symbol, list[Order]], conversions: int, trader_data: str) -> None:
         base_length = len(
@@ -26,6 +79,11 @@ class Logger:
 
         # We truncate state.traderData, trader_data, and self.logs to the same max. length to fit the log limit
         max_item_length = (self.max_log_length - base_length) // 3
+        ring = "".join(self.ring)
+        if len(ring) > max_item_length: # keep the newest high priority messages, cut from the front
+            ring = "..." + ring[len(ring) - max_item_length + 3:]
+        remaining = max_item_length - len(ring)
+        logs = ring + (self.truncate("".join(self.logs), remaining) if remaining > 3 else "")
 
         print(
             self.to_json(
@@ -34,12 +92,16 @@ class Logger:
                     self.compress_orders(orders),
                     conversions,
                     self.truncate(trader_data, max_item_length),
-                    self.truncate(self.logs, max_item_length),
+                    self.truncate(logs, max_item_length),
                 ]
             )
         )
 
-        self.logs = ""
+        self.logs = []
+        self.length = 0
+        self.ring.clear()
+        self.ring_length = 0
+        self.budget = max_item_length
 
     def compress_state(self, state: TradingState, trader_data: str) -> list[Any]:
         return [
@@ -135,12 +197,154 @@ class Product:
 
         
 
+class FairValueModel: # order book fair value estimators for every symbol, computed in one pass per tick
+    def __init__(self, levels: int = 3) -> None:
+        self.levels = levels
+        self.best_bid: dict[str, int] = {}
+        self.best_ask: dict[str, int] = {}
+        self.best_bid_volume: dict[str, int] = {}
+        self.best_ask_volume: dict[str, int] = {}
+        self.mid: dict[str, float] = {}
+        self.microprice: dict[str, float] = {}
+        self.depth_mid: dict[str, float] = {}
+        self.imbalance: dict[str, float] = {}
+        self.ofi: dict[str, float] = {}
+        self.stale: dict[str, bool] = {} # True if the last book was empty or one sided and values are carried over
+
+    def update(self, order_depths: dict[str, OrderDepth]) -> None:
+        for symbol, order_depth in order_depths.items():
+            buy_orders = order_depth.buy_orders
+            sell_orders = order_depth.sell_orders
+            if len(buy_orders) == 0 or len(sell_orders) == 0:
+                self.stale[symbol] = True
+                self.ofi[symbol] = 0.0
+                continue
+
+            bids = sorted(buy_orders.keys(), reverse=True)[:self.levels]
+            asks = sorted(sell_orders.keys())[:self.levels]
+            best_bid = bids[0]
+            best_ask = asks[0]
+            best_bid_volume = buy_orders[best_bid]
+            best_ask_volume = -sell_orders[best_ask]
+
+            # order flow imbalance (Cont et al.) against the last two sided book
+            if symbol in self.best_bid:
+                prev_bid = self.best_bid[symbol]
+                prev_ask = self.best_ask[symbol]
+                ofi = 0.0
+                if best_bid >= prev_bid:
+                    ofi += best_bid_volume
+                if best_bid <= prev_bid:
+                    ofi -= self.best_bid_volume[symbol]
+                if best_ask <= prev_ask:
+                    ofi -= best_ask_volume
+                if best_ask >= prev_ask:
+                    ofi += self.best_ask_volume[symbol]
+                self.ofi[symbol] = ofi
+            else:
+                self.ofi[symbol] = 0.0
+
+            bid_depth = 0
+            bid_notional = 0
+            for price in bids:
+                bid_depth += buy_orders[price]
+                bid_notional += price * buy_orders[price]
+            ask_depth = 0
+            ask_notional = 0
+            for price in asks:
+                ask_depth -= sell_orders[price]
+                ask_notional -= price * sell_orders[price]
+
+            self.best_bid[symbol] = best_bid
+            self.best_ask[symbol] = best_ask
+            self.best_bid_volume[symbol] = best_bid_volume
+            self.best_ask_volume[symbol] = best_ask_volume
+            self.mid[symbol] = (best_bid + best_ask) / 2
+            top_volume = best_bid_volume + best_ask_volume
+            # microprice leans towards the side with less resting volume
+            self.microprice[symbol] = (best_bid * best_ask_volume + best_ask * best_bid_volume) / top_volume if top_volume > 0 else self.mid[symbol]
+            # same weighting applied to the volume weighted price of each side over all levels
+            total_depth = bid_depth + ask_depth
+            if bid_depth > 0 and ask_depth > 0:
+                self.depth_mid[symbol] = (bid_notional / bid_depth * ask_depth + ask_notional / ask_depth * bid_depth) / total_depth
+                self.imbalance[symbol] = (bid_depth - ask_depth) / total_depth
+            else:
+                self.depth_mid[symbol] = self.mid[symbol]
+                self.imbalance[symbol] = 0.0
+            self.stale[symbol] = False
+
+
+class AccountingModel: # positions, average cost and PnL per product, reconciled from own fills every tick
+    def __init__(self, products: list[str]) -> None:
+        self.index: dict[str, int] = {product: i for i, product in enumerate(products)}
+        n = len(products)
+        self.quantity: list[int] = [0] * n
+        self.avgCost: list[float] = [0.0] * n
+        self.realized: list[float] = [0.0] * n
+        self.unrealized: list[float] = [0.0] * n
+        self.mark: list[float] = [0.0] * n
+        self.hasMark: list[bool] = [False] * n # no two sided book seen yet, mark is meaningless
+        self.lastTradeTimestamp = -1 # own_trades at or before this were already booked
+
+    def fill(self, i: int, quantity: int, price: float) -> None: # quantity > 0 for buys, < 0 for sells
+        position = self.quantity[i]
+        new_position = position + quantity
+        if position == 0 or (position > 0) == (quantity > 0):
+            self.avgCost[i] = (self.avgCost[i] * abs(position) + price * abs(quantity)) / abs(new_position)
+        else:
+            closed = min(abs(position), abs(quantity))
+            self.realized[i] += closed * (price - self.avgCost[i]) * (1 if position > 0 else -1)
+            if new_position == 0:
+                self.avgCost[i] = 0.0
+            elif (new_position > 0) != (position > 0): # flipped through zero, remainder opened at this price
+                self.avgCost[i] = price
+        self.quantity[i] = new_position
+
+    def update(self, state: TradingState, fairValues: FairValueModel) -> None:
+        last_timestamp = self.lastTradeTimestamp
+        for symbol, trades in state.own_trades.items():
+            i = self.index.get(symbol)
+            if i is None:
+                continue
+            for trade in trades:
+                if trade.timestamp <= self.lastTradeTimestamp:
+                    continue
+                if trade.buyer == "SUBMISSION":
+                    self.fill(i, trade.quantity, trade.price)
+                elif trade.seller == "SUBMISSION":
+                    self.fill(i, -trade.quantity, trade.price)
+                last_timestamp = max(last_timestamp, trade.timestamp)
+        self.lastTradeTimestamp = last_timestamp
+
+        for product, i in self.index.items():
+            # the exchange position is the truth, fills we could not see are booked at the mark
+            mark = fairValues.mid.get(product)
+            if mark is not None:
+                self.mark[i] = mark
+                self.hasMark[i] = True
+            if not self.hasMark[i]:
+                continue # reconcile once there is a price to book the difference at
+            position = state.position.get(product, 0)
+            if position != self.quantity[i]:
+                logger.warning("Position mismatch", product, self.quantity[i], position, module="AccountingModel")
+                self.fill(i, position - self.quantity[i], self.mark[i])
+            self.unrealized[i] = self.quantity[i] * (self.mark[i] - self.avgCost[i]) if self.quantity[i] != 0 else 0.0
+
+    def pnl(self, product: str) -> float:
+        i = self.index[product]
+        return self.realized[i] + self.unrealized[i]
+
+    def totalPnl(self) -> float:
+        return sum(self.realized) + sum(self.unrealized)
+
+
 class OrderModel: # handles orders, positioning and data storage
-    def __init__(self, product: str, OD: OrderDepth) -> None:
+    def __init__(self, product: str, OD: OrderDepth, accounting: AccountingModel = None) -> None:
         self.product = product
-        self.position : tuple[int, int] = (0, 0) # (quantity, price)
+        self.accounting = accounting if accounting is not None else AccountingModel([product])
+        self.index = self.accounting.index[product]
         self.Data: OrderDepth = OD
-        
+        self.lastData: tuple[int, int, int, int, int, int] = (None, None, None, None, None, None)
 
         # class OrderDepth:
         #     def __init__(self):
@@ -149,24 +353,34 @@ class OrderModel: # handles orders, positioning and data storage
 
     def update(self, orderd: OrderDepth): 
         self.Data = orderd
+
+    @property
+    def position(self) -> int:
+        return self.accounting.quantity[self.index]
+
+    @property
+    def avgCost(self) -> float:
+        return self.accounting.avgCost[self.index]
+
+    @property
+    def pnl(self) -> float:
+        return self.accounting.realized[self.index] + self.accounting.unrealized[self.index]
     
     def liquidate(self) -> list[Order]:
-        if self.position == (0, 0):
-            print("No position to liquidate")
+        if self.position == 0:
+            logger.debug("No position to liquidate", module="OrderModel")
             return
-        print("Liquidating, last price: ", self.position[1])
-        return self.sendMarketOrder(-self.position[0])
+        logger.info("Liquidating, average cost: ", self.avgCost, module="OrderModel")
+        return self.sendMarketOrder(-self.position)
     
     def sendOrder(self, quantity: int, price: int) -> list[Order]: 
         return [Order(self.product, price, quantity)]
     
-    def sendMarketOrder(self, quantity: int) -> list[Order]:
+    def sendMarketOrder(self, quantity: int) -> list[Order]: # position is booked from fills by AccountingModel
         orders = []
-        weighedprice = 0
-        actualquantity = 0
         
         if quantity > 0:
-            print("Buying: ", quantity)
+            logger.debug("Buying: ", quantity, module="OrderModel")
             while not quantity == 0 and len(self.Data.buy_orders) > 0:
                 best_ask = min(self.Data.buy_orders.keys())
                 if self.Data.buy_orders[best_ask] >= quantity:
@@ -178,7 +392,7 @@ class OrderModel: # handles orders, positioning and data storage
                     del self.Data.buy_orders[best_ask]
                     
         elif quantity < 0:
-            print("Selling: ", abs(quantity))
+            logger.debug("Selling: ", abs(quantity), module="OrderModel")
             while not quantity == 0 and len(self.Data.sell_orders) > 0:
                 best_bid = max(self.Data.sell_orders.keys())
                 if self.Data.sell_orders[best_bid] >= abs(quantity):
@@ -189,18 +403,10 @@ class OrderModel: # handles orders, positioning and data storage
                     quantity += self.Data.sell_orders[best_bid]
                     del self.Data.sell_orders[best_bid]
         
-        for order in orders:
-            if order.quantity > 0:
-                weighedprice += order.price * order.quantity
-                actualquantity += order.quantity
-        
-        weighedprice = weighedprice / actualquantity if actualquantity > 0 else 0
-        self.position = (self.position[0] + quantity, weighedprice if self.position[0] + quantity != 0 else 0)
-        
         return orders
 
     def getDataHelper(self) -> tuple[int, int, int, int, int, int]:
-        if len(self.Data.buy_orders) > 0 and len(self.Data.sell_orders) > 0:
+        if self.Data is not None and len(self.Data.buy_orders) > 0 and len(self.Data.sell_orders) > 0:
 
             best_bid = max(self.Data.buy_orders.keys())
             best_ask = min(self.Data.sell_orders.keys())
@@ -211,11 +417,11 @@ class OrderModel: # handles orders, positioning and data storage
             else:
                 wmid = None
             mid = (best_bid + best_ask) / 2
-        return (best_bid, best_ask, best_bid_volume, best_ask_volume, wmid, mid)
+            self.lastData = (best_bid, best_ask, best_bid_volume, best_ask_volume, wmid, mid)
+        return self.lastData # last two sided book if this one is empty or one sided
             
     
 
-
 class AlphaModel:
     def __init__(self, name: str, OD: OrderDepth = None, tradestate: TradingState = None) -> None:
         self.name = name
@@ -236,50 +442,111 @@ class MultiAlphaModel(AlphaModel):
     def genAlpha(self, **kwargs) -> list[Order]:
         pass
 
+class ExpiryClock: # time to expiry of the vouchers in years, from the round number and state.timestamp
+    def __init__(self, round: int, days_to_expiry_round1: int = 7, timestamps_per_day: int = 1_000_000) -> None:
+        self.round = round
+        self.days_at_round_start = days_to_expiry_round1 - (round - 1)
+        self.timestamps_per_day = timestamps_per_day
+
+    def T(self, timestamp: int) -> float:
+        return max(self.days_at_round_start - timestamp / self.timestamps_per_day, 0.0) / 365
+
+
+SQRT_2 = math.sqrt(2.0)
+SQRT_365 = math.sqrt(365.0)
+INV_SQRT_2PI = 1.0 / math.sqrt(2 * math.pi)
+
+class OptionConstants: # per tick constants shared by the IV, greeks and smile computations
+    def __init__(self, symbols: list[str], r: float = 0.0) -> None:
+        self.r = r
+        self.strikes: list[int] = [int(symbol.split('_')[-1]) for symbol in symbols] # parsed once, not per call
+        self.logK: list[float] = [math.log(K) for K in self.strikes]
+        self.S = 0.0
+        self.T = 0.0
+        self.sqrtT = 0.0
+        self.discount = 1.0 # exp(-rT)
+        self.logSK: list[float] = [0.0] * len(self.strikes) # log(S / K)
+        self.moneyness: list[float] = [0.0] * len(self.strikes) # log(K / S) / sqrt(T in days), the smile coordinate
+
+    def update(self, S: float, T: float) -> None:
+        self.S = S
+        self.T = T
+        self.sqrtT = math.sqrt(T)
+        self.discount = math.exp(-self.r * T)
+        logS = math.log(S)
+        for i in range(len(self.strikes)):
+            self.logSK[i] = logS - self.logK[i]
+            self.moneyness[i] = -self.logSK[i] / (self.sqrtT * SQRT_365) if self.sqrtT > 0 else 0.0
+
+
 class ButterflyAlphaModel(AlphaModel):
-    def __init__(self, name: str, ticker, OD: OrderDepth = None, tradestate: TradingState = None, **kwargs) -> None:
+    def __init__(self, name: str, ticker, OD: OrderDepth = None, tradestate: TradingState = None, fairValues: FairValueModel = None, expiryClock: ExpiryClock = None, **kwargs) -> None:
         super().__init__(name, OD, tradestate)
         self.ticker = ticker
+        self.fairValues = fairValues
+        self.expiryClock = expiryClock
         self.orderModels: dict[str: OrderModel] = kwargs
-        self.parabola = [4.11060503, 0.00526344, 0.0098111]
-        self.IV = [0.0, 0.0, 0.0, 0.0, 0.0]
-        self.delta = [0.0, 0.0, 0.0, 0.0, 0.0]
+        self.constants = OptionConstants(list(self.orderModels.keys()))
+        self.parabola = [4.11060503, 0.00526344, 0.0098111] # fitted with T in days, gives daily vol
+        self.IV = [float('nan')] * 5 # nan until a strike has been solved
+        self.delta = [float('nan')] * 5
+        self.smileIV = [0.0, 0.0, 0.0, 0.0, 0.0] # parabola evaluated at each strike's moneyness
     def norm_cdf(self, x):
-        return (1.0 + math.erf(x / math.sqrt(2.0))) / 2.0
+        return (1.0 + math.erf(x / SQRT_2)) / 2.0
+
+    def d1(self, i, sigma):
+        c = self.constants
+        return (c.logSK[i] + (c.r + 0.5 * sigma ** 2) * c.T) / (sigma * c.sqrtT)
 
-    def bs_call_price(self, S, K, T, sigma, r=0.0):
+    def bs_call_price(self, i, sigma, d1=None):
+        c = self.constants
         # Handle corner cases where time or volatility is essentially zero.
-        if T <= 0 or sigma <= 0:
-            return max(0.0, S - K * math.exp(-r * T))
+        if c.T <= 0 or sigma <= 0:
+            return max(0.0, c.S - c.strikes[i] * c.discount)
         
-        d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
-        d2 = d1 - sigma * math.sqrt(T)
-        price = S * self.norm_cdf(d1) - K * math.exp(-r * T) * self.norm_cdf(d2)
+        if d1 is None:
+            d1 = self.d1(i, sigma)
+        d2 = d1 - sigma * c.sqrtT
+        price = c.S * self.norm_cdf(d1) - c.strikes[i] * c.discount * self.norm_cdf(d2)
         return price
     
-    def black_scholes_implied_vol(self, S, V, K, T, r=0.0, tol=1e-6, max_iterations=100):
+    def black_scholes_implied_vol(self, i, V, tol=1e-6, max_iterations=100, low=1e-4, high=5.0):
+        # returns nan if there is no IV in [low, high] for this price or the solve does not converge
+        c = self.constants
+        if c.T <= 0 or V <= max(0.0, c.S - c.strikes[i] * c.discount):
+            return float('nan')
 
-        sigma = 0.2  # initial guess (20% annualized volatility)
+        sigma = self.IV[i] if self.IV[i] > 0 else 0.2  # warm start from the last tick, else 20% annualized volatility
         
-        for i in range(max_iterations):
-            price = self.bs_call_price(S, K, T, sigma, r)
+        for _ in range(max_iterations):
+            d1 = self.d1(i, sigma)
+            price = self.bs_call_price(i, sigma, d1)
             diff = price - V  # error between the Black–Scholes price and observed price
             if abs(diff) < tol:
                 return sigma
+            # price is increasing in sigma, so every guess tightens the bracket around the IV
+            if diff > 0:
+                high = sigma
+            else:
+                low = sigma
             
             # Vega: sensitivity of the option price to volatility.
-            d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
-            vega = S * math.sqrt(T) * (1.0 / math.sqrt(2 * math.pi)) * math.exp(-0.5 * d1 ** 2)
-            if vega == 0:
-                break
-            sigma -= diff / vega
+            vega = c.S * c.sqrtT * INV_SQRT_2PI * math.exp(-0.5 * d1 ** 2)
+            step = sigma - diff / vega if vega > 0 else low
+            # fall back to bisection when the Newton step leaves the bracket
+            sigma = step if low < step < high else (low + high) / 2
         
-        return sigma
+        return float('nan')
     
-    def compute_delta(self, S, K, T, sigma, r=0.0):
-        d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
-        delta = self.norm_cdf(d1)
+    def compute_delta(self, i, sigma):
+        if self.constants.T <= 0 or sigma <= 0:
+            return 1.0 if self.constants.logSK[i] > 0 else 0.0
+        delta = self.norm_cdf(self.d1(i, sigma))
         return delta
+
+    def compute_smile(self, i): # annualized, same units as self.IV
+        m = self.constants.moneyness[i]
+        return (self.parabola[0] * m ** 2 + self.parabola[1] * m + self.parabola[2]) * SQRT_365
         
     # def compute_iv(df):
     #     """
@@ -325,11 +592,22 @@ class ButterflyAlphaModel(AlphaModel):
     
     def Update(self, state: TradingState):
         self.tradestate = state
-        _,_,_,_,_,umid= self.ticker.getDataHelper()
-        keys = list(self.orderModels.keys())
-        for i in range(0, 5):
-            _,_,_,_,_,mid= self.orderModels[self.ticker].getDataHelper()
-            self.IV[i] = self.black_scholes_implied_vol(umid, mid, int(keys[0].split('_')[-1]), 5/365)
+        umid = self.fairValues.mid.get(self.ticker)
+        if umid is None:
+            return
+        self.constants.update(umid, self.expiryClock.T(state.timestamp))
+        for i, symbol in enumerate(self.orderModels.keys()):
+            mid = self.fairValues.mid.get(symbol)
+            if mid is None:
+                continue
+            self.smileIV[i] = self.compute_smile(i)
+            iv = self.black_scholes_implied_vol(i, mid)
+            if math.isnan(iv):
+                continue # keep the last good IV and delta
+            self.IV[i] = iv
+            self.delta[i] = self.compute_delta(i, self.IV[i])
+            if not 0.5 < self.smileIV[i] / iv < 2.0: # smile and solved IV should agree to well within a factor of 2
+                logger.warning("Smile IV off", symbol, self.smileIV[i], iv, module="ButterflyAlphaModel")
 
         
         
@@ -339,16 +617,25 @@ class ButterflyAlphaModel(AlphaModel):
 
 class Trader:
     def __init__(self) -> None:
+        self.accounting = AccountingModel([value for key, value in vars(Product).items() if not key.startswith('_')])
         self.orderModels: dict[str: OrderModel] = {
-            Product.RAINFOREST_RESIN: OrderModel(Product.RAINFOREST_RESIN, None),
-            Product.KELP: OrderModel(Product.KELP, None),
-            Product.SQUID_INK: OrderModel(Product.SQUID_INK, None),
-            Product.CROISSANTS: OrderModel(Product.CROISSANTS, None),
-            Product.DJEMBES: OrderModel(Product.DJEMBES, None),
-            Product.JAMS: OrderModel(Product.JAMS, None),
-            Product.PICNIC_BASKET1: OrderModel(Product.PICNIC_BASKET1, None),
-            Product.PICNIC_BASKET2: OrderModel(Product.PICNIC_BASKET2, None)
+            Product.RAINFOREST_RESIN: OrderModel(Product.RAINFOREST_RESIN, None, self.accounting),
+            Product.KELP: OrderModel(Product.KELP, None, self.accounting),
+            Product.SQUID_INK: OrderModel(Product.SQUID_INK, None, self.accounting),
+            Product.CROISSANTS: OrderModel(Product.CROISSANTS, None, self.accounting),
+            Product.DJEMBES: OrderModel(Product.DJEMBES, None, self.accounting),
+            Product.JAMS: OrderModel(Product.JAMS, None, self.accounting),
+            Product.PICNIC_BASKET1: OrderModel(Product.PICNIC_BASKET1, None, self.accounting),
+            Product.PICNIC_BASKET2: OrderModel(Product.PICNIC_BASKET2, None, self.accounting),
+            Product.VOLCANIC_ROCK: OrderModel(Product.VOLCANIC_ROCK, None, self.accounting),
+            Product.VOLCANIC_ROCK_VOUCHER_9500: OrderModel(Product.VOLCANIC_ROCK_VOUCHER_9500, None, self.accounting),
+            Product.VOLCANIC_ROCK_VOUCHER_9750: OrderModel(Product.VOLCANIC_ROCK_VOUCHER_9750, None, self.accounting),
+            Product.VOLCANIC_ROCK_VOUCHER_10000: OrderModel(Product.VOLCANIC_ROCK_VOUCHER_10000, None, self.accounting),
+            Product.VOLCANIC_ROCK_VOUCHER_10250: OrderModel(Product.VOLCANIC_ROCK_VOUCHER_10250, None, self.accounting),
+            Product.VOLCANIC_ROCK_VOUCHER_10500: OrderModel(Product.VOLCANIC_ROCK_VOUCHER_10500, None, self.accounting)
         }
+        self.fairValueModel = FairValueModel()
+        self.expiryClock = ExpiryClock(round=3)
         # self.pairTradeAlphaModel = MultiAlphaModel("PairTradeAlphaModel",
         #                                           **{Product.CROISSANTS : self.orderModels[Product.CROISSANTS],
         #                                              Product.DJEMBES : self.orderModels[Product.DJEMBES],
@@ -357,6 +644,8 @@ class Trader:
         #                                           )
         self.butterflyAlphaModel = ButterflyAlphaModel("ButterflyAlphaModel",
                                                         Product.VOLCANIC_ROCK,
+                                                        fairValues=self.fairValueModel,
+                                                        expiryClock=self.expiryClock,
                                                         **{Product.VOLCANIC_ROCK_VOUCHER_9500 : self.orderModels[Product.VOLCANIC_ROCK_VOUCHER_9500],
                                                              Product.VOLCANIC_ROCK_VOUCHER_9750 : self.orderModels[Product.VOLCANIC_ROCK_VOUCHER_9750],
                                                              Product.VOLCANIC_ROCK_VOUCHER_10000 : self.orderModels[Product.VOLCANIC_ROCK_VOUCHER_10000],
@@ -374,6 +663,9 @@ class Trader:
         for product in state.order_depths.keys():
             order_depth = state.order_depths[product]
             self.orderModels[product].update(order_depth)
+        self.fairValueModel.update(state.order_depths)
+        self.accounting.update(state, self.fairValueModel)
+        logger.info("PnL", self.accounting.totalPnl(), module="AccountingModel")
         self.butterflyAlphaModel.Update(state)
                         
             # result[product] = self.orderModels[product].sendMarketOrder(1)
@@ -0,0 +1,257 @@
+from typing import Any, Callable, Dict, Generator, List, Optional
+import contextlib
+import math
+import os
+import numpy as np
+from datamodel import Listing, Observation, Order, OrderDepth, Symbol, Trade, TradingState
+
+# Synthetic VOLCANIC_ROCK market for stress-testing strategies over many paths.
+# Prices for all paths are advanced together in NumPy one tick at a time, and
+# TradingState objects are only built for the tick being handed to the traders.
+
+UNDERLYING = "VOLCANIC_ROCK"
+VOUCHER_STRIKES: Dict[Symbol, int] = {
+    "VOLCANIC_ROCK_VOUCHER_9500": 9500,
+    "VOLCANIC_ROCK_VOUCHER_9750": 9750,
+    "VOLCANIC_ROCK_VOUCHER_10000": 10000,
+    "VOLCANIC_ROCK_VOUCHER_10250": 10250,
+    "VOLCANIC_ROCK_VOUCHER_10500": 10500,
+}
+POSITION_LIMITS: Dict[Symbol, int] = {UNDERLYING: 400, **{symbol: 200 for symbol in VOUCHER_STRIKES}}
+
+TICKS_PER_DAY = 10000
+TIMESTAMP_STEP = 100
+BOT_ID = "BOT"
+SUBMISSION_ID = "SUBMISSION"
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    # Abramowitz & Stegun 7.1.26, numpy has no vectorized erf (max error ~1.5e-7)
+    z = np.abs(x) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def bs_call_price(S: np.ndarray, K: np.ndarray, T: float, sigma: np.ndarray) -> np.ndarray:
+    if T <= 0:
+        return np.maximum(S - K, 0.0)
+    sqrt_t = math.sqrt(T)
+    d1 = (np.log(S / K) + 0.5 * sigma ** 2 * T) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    return S * norm_cdf(d1) - K * norm_cdf(d2)
+
+
+class SmileModel: # implied vol smile, iv = a * m^2 + b * m + c with m = log(K / S) / sqrt(T)
+    def __init__(self, coeffs: tuple[float, float, float] = (0.25, 0.0, 0.15), floor: float = 1e-4) -> None:
+        self.coeffs = coeffs
+        self.floor = floor
+
+    def iv(self, S: np.ndarray, K: np.ndarray, T: float) -> np.ndarray:
+        a, b, c = self.coeffs
+        m = np.log(K / S) / math.sqrt(max(T, 1e-12))
+        return np.maximum(a * m ** 2 + b * m + c, self.floor)
+
+
+class MarketSimulator:
+    def __init__(self,
+                 n_paths: int = 1000,
+                 n_ticks: int = TICKS_PER_DAY,
+                 s0: float = 10000.0,
+                 sigma: float = 0.15,
+                 mu: float = 0.0,
+                 jump_intensity: float = 0.0,
+                 jump_mean: float = 0.0,
+                 jump_std: float = 0.0,
+                 days_to_expiry: float = 5.0,
+                 smile: Optional[SmileModel] = None,
+                 half_spread: Optional[Dict[Symbol, float]] = None,
+                 levels: int = 3,
+                 volume_range: tuple[int, int] = (5, 30),
+                 position_limits: Optional[Dict[Symbol, int]] = None,
+                 seed: Optional[int] = None) -> None:
+        # sigma, mu and jump_intensity are annualized, jump sizes are in log space
+        self.n_paths = n_paths
+        self.n_ticks = n_ticks
+        self.s0 = s0
+        self.sigma = sigma
+        self.mu = mu
+        self.jump_intensity = jump_intensity
+        self.jump_mean = jump_mean
+        self.jump_std = jump_std
+        self.days_to_expiry = days_to_expiry
+        self.smile = smile if smile is not None else SmileModel()
+        self.half_spread = {UNDERLYING: 1.0, **{symbol: 1.0 for symbol in VOUCHER_STRIKES}}
+        if half_spread is not None:
+            self.half_spread.update(half_spread)
+        self.levels = levels
+        self.volume_range = volume_range
+        self.position_limits = position_limits if position_limits is not None else dict(POSITION_LIMITS)
+        self.rng = np.random.default_rng(seed)
+
+        self.symbols: List[Symbol] = [UNDERLYING] + list(VOUCHER_STRIKES.keys())
+        self.strikes = np.array(list(VOUCHER_STRIKES.values()), dtype=float)
+        self.listings = {symbol: Listing(symbol, symbol, "SEASHELLS") for symbol in self.symbols}
+        self.dt = 1.0 / (365 * TICKS_PER_DAY)
+
+        # per path state
+        self.S = np.full(n_paths, s0, dtype=float)
+        self.fair = np.zeros((n_paths, len(self.symbols)))
+        self.positions = np.zeros((n_paths, len(self.symbols)), dtype=int)
+        self.cash = np.zeros(n_paths)
+
+    def time_to_expiry(self, tick: int) -> float:
+        return max(self.days_to_expiry - tick / TICKS_PER_DAY, 0.0) / 365
+
+    def step(self) -> None: # advance every path by one tick (GBM with Merton jumps)
+        sigma_dt = self.sigma * math.sqrt(self.dt)
+        drift = (self.mu - 0.5 * self.sigma ** 2) * self.dt
+        log_ret = drift + sigma_dt * self.rng.standard_normal(self.n_paths)
+        if self.jump_intensity > 0:
+            n_jumps = self.rng.poisson(self.jump_intensity * self.dt, self.n_paths)
+            # sum of n iid normal jumps ~ N(n * mean, n * std^2); compensate the drift so E[S] is unchanged
+            kappa = math.exp(self.jump_mean + 0.5 * self.jump_std ** 2) - 1.0
+            log_ret += n_jumps * self.jump_mean + np.sqrt(n_jumps) * self.jump_std * self.rng.standard_normal(self.n_paths)
+            log_ret -= self.jump_intensity * kappa * self.dt
+        self.S *= np.exp(log_ret)
+
+    def price(self, tick: int) -> None: # fair values for every symbol on every path
+        T = self.time_to_expiry(tick)
+        S = self.S[:, None]
+        K = self.strikes[None, :]
+        self.fair[:, 0] = self.S
+        self.fair[:, 1:] = bs_call_price(S, K, T, self.smile.iv(S, K, T))
+
+    def quote(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # bots quote `levels` price levels on each side around fair, one tick apart
+        half = np.array([self.half_spread[symbol] for symbol in self.symbols])[None, :, None]
+        offsets = np.arange(self.levels)[None, None, :]
+        fair = self.fair[:, :, None]
+        bids = np.floor(fair - half) - offsets
+        asks = np.ceil(fair + half) + offsets
+        bids = np.maximum(bids, 0)
+        asks = np.maximum(asks, bids + 1)
+        low, high = self.volume_range
+        shape = (self.n_paths, len(self.symbols), self.levels)
+        bid_volumes = self.rng.integers(low, high + 1, shape)
+        ask_volumes = self.rng.integers(low, high + 1, shape)
+        return bids.astype(int), bid_volumes, asks.astype(int), ask_volumes
+
+    def build_order_depths(self, path: int, bids, bid_volumes, asks, ask_volumes) -> Dict[Symbol, OrderDepth]:
+        order_depths = {}
+        for j, symbol in enumerate(self.symbols):
+            depth = OrderDepth()
+            for level in range(self.levels):
+                bid = int(bids[path, j, level])
+                ask = int(asks[path, j, level])
+                depth.buy_orders[bid] = depth.buy_orders.get(bid, 0) + int(bid_volumes[path, j, level])
+                depth.sell_orders[ask] = depth.sell_orders.get(ask, 0) - int(ask_volumes[path, j, level])
+            order_depths[symbol] = depth
+        return order_depths
+
+    def match(self, path: int, orders: Dict[Symbol, List[Order]], order_depths: Dict[Symbol, OrderDepth], timestamp: int) -> Dict[Symbol, List[Trade]]:
+        # orders only trade against the bot book that was shown, passive orders are not filled
+        own_trades: Dict[Symbol, List[Trade]] = {}
+        for symbol, symbol_orders in orders.items():
+            if symbol not in order_depths or not symbol_orders:
+                continue
+            j = self.symbols.index(symbol)
+            position = int(self.positions[path, j])
+            limit = self.position_limits.get(symbol, 0)
+            total_buy = sum(order.quantity for order in symbol_orders if order.quantity > 0)
+            total_sell = sum(-order.quantity for order in symbol_orders if order.quantity < 0)
+            # exchange rule, all orders of a product are cancelled if they could breach the limit
+            if position + total_buy > limit or position - total_sell < -limit:
+                continue
+
+            depth = order_depths[symbol]
+            trades = []
+            for order in symbol_orders:
+                remaining = abs(order.quantity)
+                if order.quantity > 0:
+                    for ask in sorted(depth.sell_orders.keys()):
+                        if remaining == 0 or ask > order.price:
+                            break
+                        fill = min(remaining, -depth.sell_orders[ask])
+                        depth.sell_orders[ask] += fill
+                        if depth.sell_orders[ask] == 0:
+                            del depth.sell_orders[ask]
+                        remaining -= fill
+                        self.positions[path, j] += fill
+                        self.cash[path] -= fill * ask
+                        trades.append(Trade(symbol, ask, fill, SUBMISSION_ID, BOT_ID, timestamp))
+                elif order.quantity < 0:
+                    for bid in sorted(depth.buy_orders.keys(), reverse=True):
+                        if remaining == 0 or bid < order.price:
+                            break
+                        fill = min(remaining, depth.buy_orders[bid])
+                        depth.buy_orders[bid] -= fill
+                        if depth.buy_orders[bid] == 0:
+                            del depth.buy_orders[bid]
+                        remaining -= fill
+                        self.positions[path, j] -= fill
+                        self.cash[path] += fill * bid
+                        trades.append(Trade(symbol, bid, fill, BOT_ID, SUBMISSION_ID, timestamp))
+            if trades:
+                own_trades[symbol] = trades
+        return own_trades
+
+    def states(self) -> Generator[List[TradingState], Optional[List[Dict[Symbol, List[Order]]]], None]:
+        # Yields one TradingState per path for every tick. Send back a list with each
+        # path's orders to have them matched before the next tick is generated.
+        own_trades: List[Dict[Symbol, List[Trade]]] = [{} for _ in range(self.n_paths)]
+        for tick in range(self.n_ticks):
+            if tick > 0:
+                self.step()
+            self.price(tick)
+            timestamp = tick * TIMESTAMP_STEP
+            bids, bid_volumes, asks, ask_volumes = self.quote()
+
+            states = []
+            for path in range(self.n_paths):
+                position = {symbol: int(self.positions[path, j]) for j, symbol in enumerate(self.symbols) if self.positions[path, j] != 0}
+                states.append(TradingState("",
+                                           timestamp,
+                                           self.listings,
+                                           self.build_order_depths(path, bids, bid_volumes, asks, ask_volumes),
+                                           own_trades[path],
+                                           {},
+                                           position,
+                                           Observation({}, {})))
+
+            orders = yield states
+            own_trades = [{} for _ in range(self.n_paths)]
+            if orders is None:
+                continue
+            for path, path_orders in enumerate(orders):
+                if path_orders:
+                    # match against a fresh copy so the trader's own edits to the book don't leak in
+                    order_depths = self.build_order_depths(path, bids, bid_volumes, asks, ask_volumes)
+                    own_trades[path] = self.match(path, path_orders, order_depths, timestamp)
+
+    def mark_to_market(self) -> np.ndarray: # PnL of every path at current fair values
+        return self.cash + (self.positions * self.fair).sum(axis=1)
+
+
+def simulate(trader_factory: Callable[[], Any], quiet: bool = True, **kwargs) -> np.ndarray:
+    # Runs one Trader per path through a MarketSimulator and returns the final PnL of every path
+    simulator = MarketSimulator(**kwargs)
+    traders = [trader_factory() for _ in range(simulator.n_paths)]
+    trader_data = [""] * simulator.n_paths
+    generator = simulator.states()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext():
+        states = next(generator)
+        while True:
+            orders = []
+            for path, state in enumerate(states):
+                state.traderData = trader_data[path]
+                result, _, trader_data[path] = traders[path].run(state)
+                orders.append(result)
+            try:
+                states = generator.send(orders)
+            except StopIteration:
+                break
+
+    return simulator.mark_to_market()